@@ -1,104 +1,280 @@
-import json
 import boto3
 import logging
-import traceback
+import functools
 import os
-from typing import Dict, List
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set, Tuple
 from string import Template
+from botocore.config import Config
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from glue_table_input import build_table_input
+
+# orjson is optional; it parses the config bytes considerably faster when packaged
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize Athena client
-athena_client = boto3.client('athena')
+def validate_env_vars() -> None:
+    """Validate that all required environment variables are set."""
+    required_vars = ['DATABASE_NAME', 'DATA_BUCKET', 'RESULTS_BUCKET']
+    missing_vars = [var for var in required_vars if not os.environ.get(var)]
+    
+    if missing_vars:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+# Environment variables cannot change between warm invocations, so validate them
+# once at import time and fail the cold start on misconfiguration
+validate_env_vars()
 
 # Get configuration from environment variables
 DATABASE = os.environ['DATABASE_NAME']
 DATA_BUCKET = os.environ['DATA_BUCKET']
+# Prefix for table locations, built once instead of per CreateTable call
+DATA_LOCATION_PREFIX = f's3://{DATA_BUCKET}/'
 RESULTS_BUCKET = os.environ['RESULTS_BUCKET']
+# Every query runs against the same database, so its execution context never changes
+QUERY_EXECUTION_CONTEXT = {
+    'Database': DATABASE
+}
+# Maximum number of DDL queries submitted concurrently; keep below the Athena DDL quota
+ATHENA_CONCURRENCY = max(1, int(os.environ.get('ATHENA_CONCURRENCY', '10')))
+# Seconds to wait on each StartQueryExecution attempt before retrying
+ATHENA_SUBMIT_TIMEOUT = float(os.environ.get('ATHENA_SUBMIT_TIMEOUT', '2'))
+# Seconds to reuse the list of existing tables across warm invocations
+EXISTING_TABLES_TTL = float(os.environ.get('EXISTING_TABLES_TTL', '60'))
+
+# Cached table names from the last GetTables listing
+_existing_tables = None
+_existing_tables_fetched_at = 0.0
+
+# The QueryExecutionId is never used, so short timeouts keep a slow StartQueryExecution
+# response from holding up the invocation. botocore retries timeouts as well, so a table
+# is only treated as submitted after all 4 attempts time out: roughly 4 x ATHENA_SUBMIT_TIMEOUT
+# plus up to 7 s of backoff (about 15 s with the 2 s default)
+ATHENA_CLIENT_CONFIG = Config(
+    connect_timeout=ATHENA_SUBMIT_TIMEOUT,
+    read_timeout=ATHENA_SUBMIT_TIMEOUT,
+    retries={'max_attempts': 3},
+    max_pool_connections=max(10, ATHENA_CONCURRENCY)
+)
+
+@functools.lru_cache(maxsize=1)
+def get_athena_client():
+    """Create the Athena client on first use and reuse it across warm invocations."""
+    return boto3.client('athena', config=ATHENA_CLIENT_CONFIG)
+
+@functools.lru_cache(maxsize=1)
+def get_glue_client():
+    """Create the Glue client on first use and reuse it across warm invocations."""
+    return boto3.client(
+        'glue',
+        config=Config(
+            retries={'mode': 'adaptive', 'max_attempts': 20},
+            max_pool_connections=max(10, ATHENA_CONCURRENCY)
+        )
+    )
 
+def get_existing_tables() -> Set[str]:
+    """Return the names of tables already in the database, cached for EXISTING_TABLES_TTL seconds."""
+    global _existing_tables, _existing_tables_fetched_at
+    
+    now = time.monotonic()
+    if _existing_tables is not None and now - _existing_tables_fetched_at < EXISTING_TABLES_TTL:
+        return _existing_tables
+    
+    try:
+        existing = set()
+        paginator = get_glue_client().get_paginator('get_tables')
+        for page in paginator.paginate(DatabaseName=DATABASE):
+            existing.update(table['Name'] for table in page['TableList'])
+    except Exception as e:
+        # Listing is only an optimization; fall back to attempting every table
+        logger.warning("Error listing existing tables: %s", e)
+        return set()
+    
+    _existing_tables = existing
+    _existing_tables_fetched_at = now
+    return _existing_tables
+
+@functools.lru_cache(maxsize=1)
 def read_table_configs() -> List[Dict]:
-    """Read table configurations from the JSON file."""
+    """Read table configurations from the JSON file, parsing it once per container."""
     try:
-        with open('table_configs.json', 'r') as file:
-            return json.load(file)['tables']
+        with open('table_configs.json', 'rb') as file:
+            return json_loads(file.read())['tables']
     except Exception as e:
-        logger.error(f"Error reading table configurations: {str(e)}")
+        logger.error("Error reading table configurations: %s", e)
         raise
 
-def execute_query(query: str, database: str) -> bool:
-    """Execute Athena query and return success status."""
+def execute_query(table_name: str, query: str, result_configuration: Dict) -> bool:
+    """Execute the Athena query that creates table_name and return success status."""
     try:
-        response = athena_client.start_query_execution(
+        response = get_athena_client().start_query_execution(
             QueryString=query,
-            QueryExecutionContext={
-                'Database': database
-            },
-            ResultConfiguration={
-                'OutputLocation': f's3://{RESULTS_BUCKET}/athena-query-results/'
-            }
+            QueryExecutionContext=QUERY_EXECUTION_CONTEXT,
+            ResultConfiguration=result_configuration
+        )
+        # DDL can run to kilobytes, so skip the call entirely when INFO is filtered out
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Successfully executed query: %s", query)
+        return True
+    except ReadTimeoutError:
+        # botocore sends the same auto-generated ClientRequestToken on every retry, so Athena
+        # deduplicates the attempts and a missed response is not treated as a failure
+        logger.warning("Submitted query for table %s without receiving a response", table_name)
+        return True
+    except Exception as e:
+        logger.error("Error executing query: %s", e)
+        return False
+
+def create_glue_table(table_config: Dict) -> bool:
+    """Create a metadata-only table directly through the Glue CreateTable API."""
+    try:
+        get_glue_client().create_table(
+            DatabaseName=DATABASE,
+            TableInput=build_table_input(table_config, DATA_LOCATION_PREFIX)
         )
-        logger.info(f"Successfully executed query: {query}")
         return True
+        
+    except ClientError as e:
+        error_code = e.response.get('Error', {}).get('Code')
+        if error_code == 'AlreadyExistsException':
+            logger.warning("Table %s already exists", table_config['name'])
+            return True
+        else:
+            logger.error("Error creating table %s: %s", table_config['name'], e)
+            return False
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
+        logger.error("Unexpected error creating table %s: %s", table_config['name'], e)
         return False
 
-def create_tables(table_configs: List[Dict]) -> Dict:
-    """Create Athena tables based on configurations."""
-    success_count = 0
+@functools.lru_cache(maxsize=128)
+def render_query(query_template: str, data_bucket: str) -> str:
+    """Substitute placeholders in a query template, caching the result per template and bucket."""
+    # ${DATA_BUCKET} is the only placeholder in practice, so a literal replace covers it;
+    # anything else (bare $DATA_BUCKET, $$ escapes) still goes through Template
+    if '$$' not in query_template:
+        query = query_template.replace('${DATA_BUCKET}', data_bucket)
+        if '$' not in query:
+            return query
+    
+    return Template(query_template).safe_substitute(
+        DATA_BUCKET=data_bucket
+    )
+
+def is_glue_config(config: Dict) -> bool:
+    """Return whether a config carries the metadata needed to create its table through Glue."""
+    return 'columns' in config and 'location' in config
+
+def _log_result(name: str, created: bool) -> Tuple[str, bool]:
+    """Log the outcome for a single table and return (name, success)."""
+    if created:
+        logger.info("Successfully created table: %s", name)
+    else:
+        logger.error("Failed to create table: %s", name)
+    return name, created
+
+def prepare_tables(table_configs: List[Dict]) -> Tuple[List[Tuple[Dict, Optional[str]]], List[str]]:
+    """Render queries up front, returning (config, query) pairs in config order plus failed table names.
+    
+    Configs that carry 'columns' and 'location' are created synchronously through Glue,
+    skipping the Athena query queue, and are paired with None; all others are paired with
+    the DDL query to submit to Athena. Configs whose query cannot be rendered are returned
+    as failed before any API call is made.
+    """
+    prepared = []
     failed_tables = []
     
     for config in table_configs:
+        if is_glue_config(config):
+            prepared.append((config, None))
+            continue
         try:
             # Replace placeholders in the query with actual values
-            template = Template(config['query'])
-            query = template.safe_substitute(
-                DATA_BUCKET=DATA_BUCKET
-            )
-            
-            if execute_query(query, DATABASE):
-                success_count += 1
-                logger.info(f"Successfully created table: {config['name']}")
-            else:
-                failed_tables.append(config['name'])
-                logger.error(f"Failed to create table: {config['name']}")
+            prepared.append((config, render_query(config['query'], DATA_BUCKET)))
         except Exception as e:
+            logger.error("Error processing table %s: %s", config['name'], e)
             failed_tables.append(config['name'])
-            logger.error(f"Error processing table {config['name']}: {str(e)}")
-            continue
+    
+    return prepared, failed_tables
+
+def _submit_all(prepared: List[Tuple[Dict, Optional[str]]], result_configuration: Dict) -> List[Tuple[str, bool]]:
+    """Create all tables on a bounded thread pool, returning (name, success) in config order."""
+    # Build the client before fanning out so worker threads share a single instance
+    get_athena_client()
+    
+    # The shared boto3 clients are thread-safe, so submissions can overlap
+    max_workers = min(ATHENA_CONCURRENCY, len(prepared))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            (executor.submit(create_glue_table, config) if query is None
+             else executor.submit(execute_query, config['name'], query, result_configuration)): config['name']
+            for config, query in prepared
+        }
+        # Both workers catch their own errors, so result() only reports success or failure;
+        # log each table as it finishes
+        for future in as_completed(futures):
+            _log_result(futures[future], future.result())
+    
+    # Report in submission (config) order so the response is stable across runs
+    return [(name, future.result()) for future, name in futures.items()]
+
+def create_tables(table_configs: List[Dict], result_configuration: Dict) -> Dict:
+    """Create Athena tables based on configurations, sharing one query result configuration."""
+    # Tables that already exist count as created without another DDL query;
+    # Glue stores table names in lowercase
+    existing_tables = get_existing_tables()
+    pending_configs = [config for config in table_configs if config['name'].lower() not in existing_tables]
+    if len(pending_configs) < len(table_configs):
+        logger.info("Skipped %s tables that already exist", len(table_configs) - len(pending_configs))
+    
+    # Render every query up front so bad configs fail fast without an API call
+    prepared, render_failures = prepare_tables(pending_configs)
+    
+    results = []
+    if prepared:
+        results = _submit_all(prepared, result_configuration)
+    
+    # Render and API failures are collected separately; report them in config order
+    failed = set(render_failures).union(name for name, ok in results if not ok)
+    failed_tables = [config['name'] for config in pending_configs if config['name'] in failed]
     
     return {
-        'success_count': success_count,
+        'success_count': len(table_configs) - len(failed_tables),
         'failed_tables': failed_tables,
         'total_tables': len(table_configs)
     }
 
-def validate_env_vars() -> None:
-    """Validate that all required environment variables are set."""
-    required_vars = ['DATABASE_NAME', 'DATA_BUCKET', 'RESULTS_BUCKET']
-    missing_vars = [var for var in required_vars if not os.environ.get(var)]
-    
-    if missing_vars:
-        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-
 def lambda_handler(event: Dict, context) -> Dict:
     """Lambda handler function."""
     try:
-        # Validate environment variables
-        validate_env_vars()
-        
         logger.info("Starting table creation process")
-        logger.info(f"Using Database: {DATABASE}")
-        logger.info(f"Data Bucket: {DATA_BUCKET}")
-        logger.info(f"Results Bucket: {RESULTS_BUCKET}")
+        logger.info("Using Database: %s", DATABASE)
+        logger.info("Data Bucket: %s", DATA_BUCKET)
+        logger.info("Results Bucket: %s", RESULTS_BUCKET)
+        logger.info("Athena Concurrency: %s", ATHENA_CONCURRENCY)
+        
+        # A per-invocation prefix keeps concurrent invocations from sharing one results prefix
+        output_location = f's3://{RESULTS_BUCKET}/athena-query-results/{uuid.uuid4()}/'
+        logger.info("Query Results Location: %s", output_location)
+        # Built once and shared by every query in this invocation
+        result_configuration = {
+            'OutputLocation': output_location
+        }
         
         # Read table configurations
         table_configs = read_table_configs()
         
         # Create tables
-        result = create_tables(table_configs)
+        result = create_tables(table_configs, result_configuration)
         
         return {
             'statusCode': 200,
@@ -110,8 +286,7 @@ def lambda_handler(event: Dict, context) -> Dict:
             
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error: {error_msg}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error: %s", error_msg)
         return {
             'statusCode': 500,
             'body': {
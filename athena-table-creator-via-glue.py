@@ -1,117 +1,154 @@
-import json
 import boto3
 import logging
-import traceback
+import functools
 import os
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
 from string import Template
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from glue_table_input import build_table_input
+
+# orjson is optional; it parses the config bytes considerably faster when packaged
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-glue_client = boto3.client('glue')
+def validate_env_vars() -> None:
+    """Validate that all required environment variables are set."""
+    required_vars = ['DATABASE_NAME', 'DATA_BUCKET']
+    missing_vars = [var for var in required_vars if not os.environ.get(var)]
+    
+    if missing_vars:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+# Environment variables cannot change between warm invocations, so validate them
+# once at import time and fail the cold start on misconfiguration
+validate_env_vars()
 
 # Get configuration from environment variables
 DATABASE = os.environ['DATABASE_NAME']
 DATA_BUCKET = os.environ['DATA_BUCKET']
+# Prefix for table locations, built once instead of per CreateTable call
+DATA_LOCATION_PREFIX = f's3://{DATA_BUCKET}/'
+# Maximum number of CreateTable calls issued concurrently
+GLUE_CONCURRENCY = max(1, int(os.environ.get('GLUE_CONCURRENCY', '8')))
+# Seconds to reuse the list of existing tables across warm invocations
+EXISTING_TABLES_TTL = float(os.environ.get('EXISTING_TABLES_TTL', '60'))
+
+# Cached table names from the last GetTables listing
+_existing_tables = None
+_existing_tables_fetched_at = 0.0
+
+# AWS client configuration. Adaptive retries let botocore back off on ThrottlingException
+# under concurrent CreateTable calls. The connection pool is sized to the worker count so
+# every thread gets a pooled connection (urllib3's pool is what reuses connections).
+# tcp_keepalive only enables SO_KEEPALIVE probes on those sockets.
+GLUE_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 20},
+    max_pool_connections=max(10, GLUE_CONCURRENCY),
+    tcp_keepalive=True
+)
+
+@functools.lru_cache(maxsize=1)
+def get_glue_client():
+    """Create the Glue client on first use and reuse it across warm invocations."""
+    return boto3.client('glue', config=GLUE_CLIENT_CONFIG)
+
+def get_existing_tables() -> Set[str]:
+    """Return the names of tables already in the database, cached for EXISTING_TABLES_TTL seconds."""
+    global _existing_tables, _existing_tables_fetched_at
+    
+    now = time.monotonic()
+    if _existing_tables is not None and now - _existing_tables_fetched_at < EXISTING_TABLES_TTL:
+        return _existing_tables
+    
+    try:
+        existing = set()
+        paginator = get_glue_client().get_paginator('get_tables')
+        for page in paginator.paginate(DatabaseName=DATABASE):
+            existing.update(table['Name'] for table in page['TableList'])
+    except Exception as e:
+        # Listing is only an optimization; fall back to attempting every table
+        logger.warning("Error listing existing tables: %s", e)
+        return set()
+    
+    _existing_tables = existing
+    _existing_tables_fetched_at = now
+    return _existing_tables
 
+@functools.lru_cache(maxsize=1)
 def read_table_configs() -> List[Dict]:
-    """Read table configurations from the JSON file."""
+    """Read table configurations from the JSON file, parsing it once per container."""
     try:
-        with open('table_configs.json', 'r') as file:
-            return json.load(file)['tables']
+        with open('table_configs.json', 'rb') as file:
+            return json_loads(file.read())['tables']
     except Exception as e:
-        logger.error(f"Error reading table configurations: {str(e)}")
+        logger.error("Error reading table configurations: %s", e)
         raise
 
-def parse_column_definitions(columns_config: List[Dict]) -> List[Dict]:
-    """Convert column configurations to Glue column definitions."""
-    return [
-        {
-            'Name': col['name'],
-            'Type': col['type']
-        }
-        for col in columns_config
-    ]
-
 def create_table(table_config: Dict) -> bool:
     """Create a table using Glue CreateTable API."""
     try:
-        table_input = {
-            'Name': table_config['name'],
-            'Description': table_config.get('description', ''),
-            'TableType': 'EXTERNAL_TABLE',
-            'Parameters': {
-                'classification': 'csv'
-            },
-            'StorageDescriptor': {
-                'Columns': parse_column_definitions(table_config['columns']),
-                'Location': f"s3://{DATA_BUCKET}/{table_config['location']}"
-            }
-        }
-
-        glue_client.create_table(
+        get_glue_client().create_table(
             DatabaseName=DATABASE,
-            TableInput=table_input
+            TableInput=build_table_input(table_config, DATA_LOCATION_PREFIX)
         )
         
-        logger.info(f"Successfully created table: {table_config['name']}")
+        logger.info("Successfully created table: %s", table_config['name'])
         return True
         
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code')
         if error_code == 'AlreadyExistsException':
-            logger.warning(f"Table {table_config['name']} already exists")
+            logger.warning("Table %s already exists", table_config['name'])
             return True
         else:
-            logger.error(f"Error creating table {table_config['name']}: {str(e)}")
+            logger.error("Error creating table %s: %s", table_config['name'], e)
             return False
     except Exception as e:
-        logger.error(f"Unexpected error creating table {table_config['name']}: {str(e)}")
+        logger.error("Unexpected error creating table %s: %s", table_config['name'], e)
         return False
 
 def create_tables(table_configs: List[Dict]) -> Dict:
     """Create Glue tables based on configurations."""
-    success_count = 0
-    failed_tables = []
+    # Tables that already exist count as created without another CreateTable call;
+    # Glue stores table names in lowercase
+    existing_tables = get_existing_tables()
+    pending_configs = [config for config in table_configs if config['name'].lower() not in existing_tables]
+    if len(pending_configs) < len(table_configs):
+        logger.info("Skipped %s tables that already exist", len(table_configs) - len(pending_configs))
     
-    for config in table_configs:
-        try:
-            if create_table(config):
-                success_count += 1
-            else:
-                failed_tables.append(config['name'])
-        except Exception as e:
-            failed_tables.append(config['name'])
-            logger.error(f"Error processing table {config['name']}: {str(e)}")
-            continue
+    results = []
+    if pending_configs:
+        # create_table handles its own errors, so every config yields a result
+        max_workers = min(GLUE_CONCURRENCY, len(pending_configs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(create_table, pending_configs))
+    
+    failed_tables = [config['name'] for config, ok in zip(pending_configs, results) if not ok]
+    existing_tables.update(config['name'].lower() for config, ok in zip(pending_configs, results) if ok)
     
     return {
-        'success_count': success_count,
+        'success_count': len(table_configs) - len(failed_tables),
         'failed_tables': failed_tables,
         'total_tables': len(table_configs)
     }
 
-def validate_env_vars() -> None:
-    """Validate that all required environment variables are set."""
-    required_vars = ['DATABASE_NAME', 'DATA_BUCKET']
-    missing_vars = [var for var in required_vars if not os.environ.get(var)]
-    
-    if missing_vars:
-        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-
 def lambda_handler(event: Dict, context) -> Dict:
     """Lambda handler function."""
     try:
-        # Validate environment variables
-        validate_env_vars()
-        
         logger.info("Starting table creation process")
-        logger.info(f"Using Database: {DATABASE}")
-        logger.info(f"Data Bucket: {DATA_BUCKET}")
+        logger.info("Using Database: %s", DATABASE)
+        logger.info("Data Bucket: %s", DATA_BUCKET)
+        logger.info("Glue Concurrency: %s", GLUE_CONCURRENCY)
         
         # Read table configurations
         table_configs = read_table_configs()
@@ -129,8 +166,7 @@ def lambda_handler(event: Dict, context) -> Dict:
             
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error: {error_msg}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error: %s", error_msg)
         return {
             'statusCode': 500,
             'body': {
@@ -0,0 +1,73 @@
+#!/usr/bin/env bash
+# Build a Lambda deployment package for one of the table creators.
+#
+# Usage: ./build-package.sh <glue|athena> [output.zip]
+#
+# boto3 is vendored into the package with every botocore service model except the
+# ones the function calls removed, and everything is byte-compiled ahead of time,
+# which keeps the package small and cuts the cold-start cost of importing boto3.
+# Set PYTHON to an interpreter matching the Lambda runtime (python3.9 by default)
+# so the compiled .pyc files are actually used.
+set -euo pipefail
+
+VARIANT="${1:-}"
+case "$VARIANT" in
+    glue|athena) ;;
+    *)
+        echo "Usage: $0 <glue|athena> [output.zip]" >&2
+        exit 1
+        ;;
+esac
+
+OUTPUT="$(realpath -m "${2:-$VARIANT-table-creator.zip}")"
+PYTHON="${PYTHON:-python3.9}"
+ROOT="$(cd "$(dirname "$0")" && pwd)"
+BUILD_DIR="$(mktemp -d)"
+trap 'rm -rf "$BUILD_DIR"' EXIT
+
+# Service models each variant calls; the Athena Lambda also uses Glue for the
+# existing-table lookup and metadata-only tables
+case "$VARIANT" in
+    glue) KEEP_SERVICES="glue" ;;
+    athena) KEEP_SERVICES="athena glue" ;;
+esac
+
+# Fetch wheels for the same Python version the bytecode is compiled with
+PY_VER="$("$PYTHON" -c 'import sys; print("%d.%d" % sys.version_info[:2])')"
+
+# Install wheels for the Lambda platform rather than the build host, so compiled
+# dependencies such as orjson import on Lambda wherever the package is built
+PIP_INSTALL=("$PYTHON" -m pip install --quiet --target "$BUILD_DIR"
+    --platform manylinux2014_x86_64 --only-binary=:all: --python-version "$PY_VER")
+
+"${PIP_INSTALL[@]}" boto3
+# orjson is optional at runtime, so a failed install only costs the faster parser
+"${PIP_INSTALL[@]}" orjson \
+    || echo "orjson not installed; falling back to the stdlib json parser" >&2
+
+# Drop unused service models; top-level files such as endpoints.json and
+# partitions.json are needed by every client and are left in place
+for service_dir in "$BUILD_DIR"/botocore/data/*/; do
+    service="$(basename "$service_dir")"
+    case " $KEEP_SERVICES " in
+        *" $service "*) ;;
+        *) rm -rf "$service_dir" ;;
+    esac
+done
+
+# boto3 ships resource models that the low-level clients never load
+rm -rf "$BUILD_DIR"/boto3/data
+rm -rf "$BUILD_DIR"/bin
+
+cp "$ROOT/athena-table-creator-via-$VARIANT.py" "$BUILD_DIR/index.py"
+cp "$ROOT/glue_table_input.py" "$BUILD_DIR/glue_table_input.py"
+cp "$ROOT/table-configs-$VARIANT-table.json" "$BUILD_DIR/table_configs.json"
+
+# The Lambda filesystem is read-only, so bytecode has to ship with the package. Zip keeps
+# mtimes at 2 s resolution, so timestamp-checked .pyc files could go stale on extraction
+# and be recompiled on every cold start; unchecked hashes skip that validation
+"$PYTHON" -m compileall -q --invalidation-mode unchecked-hash "$BUILD_DIR"
+
+rm -f "$OUTPUT"
+(cd "$BUILD_DIR" && zip -qr9 "$OUTPUT" .)
+echo "Built $OUTPUT"
@@ -0,0 +1,43 @@
+from operator import itemgetter
+from typing import Dict, List
+
+# Pulls (name, type) out of a column config in a single C-level call
+_column_name_and_type = itemgetter('name', 'type')
+
+# Storage format Athena uses for CSV text tables; without it Athena cannot query the table
+CSV_STORAGE_FORMAT = {
+    'InputFormat': 'org.apache.hadoop.mapred.TextInputFormat',
+    'OutputFormat': 'org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat',
+    'SerdeInfo': {
+        'SerializationLibrary': 'org.apache.hadoop.hive.serde2.lazy.LazySimpleSerDe',
+        'Parameters': {
+            'field.delim': ','
+        }
+    }
+}
+
+def parse_column_definitions(columns_config: List[Dict]) -> List[Dict]:
+    """Convert column configurations to Glue column definitions."""
+    return [
+        {
+            'Name': name,
+            'Type': col_type
+        }
+        for name, col_type in map(_column_name_and_type, columns_config)
+    ]
+
+def build_table_input(table_config: Dict, location_prefix: str) -> Dict:
+    """Build the Glue TableInput for a CSV table whose location is relative to location_prefix."""
+    return {
+        'Name': table_config['name'],
+        'Description': table_config.get('description', ''),
+        'TableType': 'EXTERNAL_TABLE',
+        'Parameters': {
+            'classification': 'csv'
+        },
+        'StorageDescriptor': {
+            'Columns': parse_column_definitions(table_config['columns']),
+            'Location': location_prefix + table_config['location'],
+            **CSV_STORAGE_FORMAT
+        }
+    }